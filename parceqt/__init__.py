@@ -38,6 +38,8 @@ accessible in this module scope:
 
 """
 
+import functools
+
 from PyQt5.QtWidgets import QApplication
 
 import parce
@@ -93,11 +95,17 @@ def highlight(doc, theme="default"):
 
     """
     if isinstance(theme, str):
-        theme = parce.theme_by_name(theme)
+        theme = _theme_by_name(theme)
     formatter = Formatter(theme) if theme else theme
     Document(doc).set_formatter(formatter)
 
 
+@functools.lru_cache(maxsize=8)
+def _theme_by_name(name):
+    """Return the named Theme, cached so that documents can share it."""
+    return parce.theme_by_name(name)
+
+
 def adjust_widget(widget):
     """Convenience function to set palette and font of a text editing ``widget``.
 
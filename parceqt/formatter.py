@@ -23,12 +23,32 @@ A Formatter that uses parce.theme.Theme with QTextCharFormat.
 """
 
 
+import bisect
+import weakref
+
 from PyQt5.QtGui import QColor, QFont, QPalette, QTextCharFormat
 from PyQt5.QtWidgets import QApplication
 
 import parce.formatter
 
 
+_text_formats = weakref.WeakValueDictionary()   # cache for text_format()
+
+# theme state and palette color group (None means all color groups)
+_PALETTE_GROUPS = (
+    ("default", None),
+    ("focus", QPalette.Active),
+    ("disabled", QPalette.Disabled),
+)
+
+# theme role and the palette roles for its foreground and background color
+_PALETTE_ROLES = (
+    ("window", QPalette.Text, QPalette.Base),
+    ("selection", QPalette.HighlightedText, QPalette.Highlight),
+    ("current-line", None, QPalette.AlternateBase),
+)
+
+
 class Formatter(parce.formatter.Formatter):
     """Formatter, inheriting from parce.Formatter, but using Qt text formats by default."""
     def __init__(self, theme, factory=None):
@@ -70,57 +90,16 @@ class Formatter(parce.formatter.Formatter):
         the widget with the properties from the theme.
 
         """
-        # all color groups
         p = QApplication.palette(widget)
-        f = self.baseformat("window")  # QTextCharFormat
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.Text, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Base, f.background().color())
-        f = self.baseformat("selection")
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.HighlightedText, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Highlight, f.background().color())
-        f = self.baseformat("current-line")
-        if f and f.hasProperty(QTextCharFormat.BackgroundBrush):
-            p.setColor(QPalette.AlternateBase, f.background().color())
-
-        # Active color group
-        f = self.baseformat("window", "focus")
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.Active, QPalette.Text, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Active, QPalette.Base, f.background().color())
-        f = self.baseformat("selection", "focus")
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.Active, QPalette.HighlightedText, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Active, QPalette.Highlight, f.background().color())
-        f = self.baseformat("current-line", "focus")
-        if f and f.hasProperty(QTextCharFormat.BackgroundBrush):
-            p.setColor(QPalette.Active, QPalette.AlternateBase, f.background().color())
-
-        # Disabled color group
-        f = self.baseformat("window", "disabled")
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.Disabled, QPalette.Text, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Disabled, QPalette.Base, f.background().color())
-        f = self.baseformat("selection", "disabled")
-        if f:
-            if f.hasProperty(QTextCharFormat.ForegroundBrush):
-                p.setColor(QPalette.Disabled, QPalette.HighlightedText, f.foreground().color())
-            if f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Disabled, QPalette.Highlight, f.background().color())
-        f = self.baseformat("current-line", "disabled")
-        if f and f.hasProperty(QTextCharFormat.BackgroundBrush):
-                p.setColor(QPalette.Disabled, QPalette.AlternateBase, f.background().color())
+        for state, group in _PALETTE_GROUPS:
+            group = () if group is None else (group,)
+            for role, fg_role, bg_role in _PALETTE_ROLES:
+                f = self.baseformat(role, state)    # QTextCharFormat
+                if f:
+                    if fg_role is not None and f.hasProperty(QTextCharFormat.ForegroundBrush):
+                        p.setColor(*group, fg_role, f.foreground().color())
+                    if f.hasProperty(QTextCharFormat.BackgroundBrush):
+                        p.setColor(*group, bg_role, f.background().color())
         return p
 
 
@@ -129,21 +108,55 @@ def _color(c):
     return QColor(c.r, c.g, c.b, int(c.a * 255))
 
 
+_FONT_POINT_SIZES = {
+    "xx-small": 8,
+    "x-small": 9,
+    "small": 10,
+    "medium": 12,
+    "large": 14,
+    "x-large": 16,
+    "xx-large": 20,
+    "xxx-large": 24,
+    "larger": 14,
+    "smaller": 10,
+}
+
+_FONT_STRETCHES = {
+    "ultra-condensed": 50,
+    "extra-condensed": 62,
+    "condensed": 75,
+    "semi-condensed": 87,
+    "normal": 100,
+    "semi-expanded": 112,
+    "expanded": 125,
+    "extra-expanded": 150,
+    "ultra-expanded": 200,
+}
+
+_FONT_WEIGHT_NAMES = {
+    "bold": QFont.Bold,
+    "bolder": QFont.ExtraBold,
+    "lighter": QFont.Light,
+}
+
+_FONT_WEIGHT_THRESHOLDS = (200, 300, 400, 500, 600, 700, 800, 900)
+_FONT_WEIGHTS = (
+    QFont.Thin,
+    QFont.ExtraLight,
+    QFont.Light,
+    QFont.Normal,
+    QFont.Medium,
+    QFont.DemiBold,
+    QFont.Bold,
+    QFont.ExtraBold,
+    QFont.Black,
+)
+
+
 def _font_point_size(size, unit):
     """Return a suitable point size, where 12 is a default value."""
     if isinstance(size, str):
-        return {
-            "xx-small": 8,
-            "x-small": 9,
-            "small": 10,
-            "medium": 12,
-            "large": 14,
-            "x-large": 16,
-            "xx-large": 20,
-            "xxx-large": 24,
-            "larger": 14,
-            "smaller": 10,
-        }.get(size, 12)
+        return _FONT_POINT_SIZES.get(size, 12)
     elif unit == "pt":
         return size
     elif unit == "px":
@@ -158,100 +171,142 @@ def _font_point_size(size, unit):
 def _font_stretch(stretch):
     """Return a suitable font stretch."""
     if isinstance(stretch, str):
-        return {
-            "ultra-condensed": 50,
-            "extra-condensed": 62,
-            "condensed": 75,
-            "semi-condensed": 87,
-            "normal": 100,
-            "semi-expanded": 112,
-            "expanded": 125,
-            "extra-expanded": 150,
-            "ultra-expanded": 200,
-        }.get(stretch, 100)
+        return _FONT_STRETCHES.get(stretch, 100)
     return int(stretch)
 
 
 def _font_weight(weight):
     """Return a suitable weight."""
     if isinstance(weight, str):
-        if weight == "bold":
-            return QFont.Bold
-        elif weight == "bolder":
-            return QFont.ExtraBold
-        elif weight == "lighter":
-            return QFont.Light
-    else:
-        if weight >= 900:
-            return QFont.Black
-        elif weight >= 800:
-            return QFont.ExtraBold
-        elif weight >= 700:
-            return QFont.Bold
-        elif weight >= 600:
-            return QFont.DemiBold
-        elif weight >= 500:
-            return QFont.Medium
-        elif weight >= 400:
-            return QFont.Normal
-        elif weight >= 300:
-            return QFont.Light
-        elif weight >= 200:
-            return QFont.ExtraLight
-        else:
-            return QFont.Thin
-    return QFont.Normal
+        return _FONT_WEIGHT_NAMES.get(weight, QFont.Normal)
+    return _FONT_WEIGHTS[bisect.bisect_right(_FONT_WEIGHT_THRESHOLDS, weight)]
 
 
 def text_format(tf):
     """A factory to be used with parce.theme.Formatter.
 
-    Creates a QTextCharFormat for the specified TextFormat object.
+    Returns a QTextCharFormat for the specified TextFormat object.
+
+    The QTextCharFormats are cached, TextFormats with the same properties get
+    the same QTextCharFormat instance. So you should not alter the returned
+    format.
 
     """
     if tf:
+        key = _text_format_key(tf)
+        f = _text_formats.get(key)
+        if f is None:
+            f = _create_text_format(tf)
+            if f is not None:
+                _text_formats[key] = f
+        return f
+
+
+def _text_format_key(tf):
+    """Return a hashable key for the properties set in the TextFormat."""
+    return frozenset((name, tuple(value) if isinstance(value, list) else value)
+                     for name, value in vars(tf).items())
+
+
+def _create_text_format(tf):
+    """Create a QTextCharFormat for the TextFormat, or None if it would be empty.
+
+    Only the properties that are actually set in the TextFormat are visited,
+    and no QTextCharFormat is created if none of them is supported. The
+    setters always run in the order of :data:`_TEXT_FORMAT_SETTERS`, so that
+    equal TextFormats yield QTextCharFormats that compare equal, regardless
+    of the order the properties were set in.
+
+    """
+    props = vars(tf)
+    setters = [setter for name, setter in _TEXT_FORMAT_SETTERS.items()
+               if props.get(name)]
+    if setters:
         f = QTextCharFormat()
-        if tf.color:
-            f.setForeground(_color(tf.color))
-        if tf.background_color:
-            f.setBackground(_color(tf.background_color))
-        if tf.text_decoration_line:
-            if 'underline' in tf.text_decoration_line:
-                f.setFontUnderline(True)
-            if 'overline' in tf.text_decoration_line:
-                f.setFontOverline(True)
-            if 'line-through' in tf.text_decoration_line:
-                f.setFontStrikeOut(True)
-        if tf.text_decoration_style:
-            s = tf.text_decoration_style
-            if s == "solid":
-                f.setUnderlineStyle(QTextCharFormat.SingleUnderline)
-            #elif s == "double":
-            #    pass # Seems Qt5 does not provide this
-            elif s == "dotted":
-                f.setUnderlineStyle(QTextCharFormat.DotLine)
-            elif s == "dashed":
-                f.setUnderlineStyle(QTextCharFormat.DashUnderline)
-            elif s == "wavy":
-                f.setUnderlineStyle(QTextCharFormat.WaveUnderline)
-        if tf.text_decoration_color:
-            f.setUnderlineColor(_color(tf.text_decoration_color))
-        if tf.font_family:
-            try:
-                f.setFontFamilies(tf.font_family)
-            except AttributeError: # this property was introduced in Qt 5.13
-                pass
-            f.setFontFamily(tf.font_family[0])
-        if tf.font_size:
-            f.setFontPointSize(_font_point_size(tf.font_size, tf.font_size_unit))
-        if tf.font_stretch:
-            f.setFontStretch(_font_stretch(tf.font_stretch))
-        if tf.font_style in ('italic', 'oblique'):
-            f.setFontItalic(True)
-        if tf.font_variant_caps == "small-caps":
-            f.setFontCapitalization(QFont.SmallCaps)
-        if tf.font_weight:
-            f.setFontWeight(_font_weight(tf.font_weight))
+        for setter in setters:
+            setter(f, tf)
         if not f.isEmpty():
             return f
 
+
+def _set_color(f, tf):
+    f.setForeground(_color(tf.color))
+
+
+def _set_background_color(f, tf):
+    f.setBackground(_color(tf.background_color))
+
+
+def _set_text_decoration_line(f, tf):
+    if 'underline' in tf.text_decoration_line:
+        f.setFontUnderline(True)
+    if 'overline' in tf.text_decoration_line:
+        f.setFontOverline(True)
+    if 'line-through' in tf.text_decoration_line:
+        f.setFontStrikeOut(True)
+
+
+def _set_text_decoration_style(f, tf):
+    style = _UNDERLINE_STYLES.get(tf.text_decoration_style)
+    if style is not None:
+        f.setUnderlineStyle(style)
+
+
+def _set_text_decoration_color(f, tf):
+    f.setUnderlineColor(_color(tf.text_decoration_color))
+
+
+def _set_font_family(f, tf):
+    try:
+        f.setFontFamilies(tf.font_family)
+    except AttributeError: # this property was introduced in Qt 5.13
+        pass
+    f.setFontFamily(tf.font_family[0])
+
+
+def _set_font_size(f, tf):
+    f.setFontPointSize(_font_point_size(tf.font_size, tf.font_size_unit))
+
+
+def _set_font_stretch(f, tf):
+    f.setFontStretch(_font_stretch(tf.font_stretch))
+
+
+def _set_font_style(f, tf):
+    if tf.font_style in ('italic', 'oblique'):
+        f.setFontItalic(True)
+
+
+def _set_font_variant_caps(f, tf):
+    if tf.font_variant_caps == "small-caps":
+        f.setFontCapitalization(QFont.SmallCaps)
+
+
+def _set_font_weight(f, tf):
+    f.setFontWeight(_font_weight(tf.font_weight))
+
+
+_UNDERLINE_STYLES = {
+    "solid": QTextCharFormat.SingleUnderline,
+    #"double": # Seems Qt5 does not provide this
+    "dotted": QTextCharFormat.DotLine,
+    "dashed": QTextCharFormat.DashUnderline,
+    "wavy": QTextCharFormat.WaveUnderline,
+}
+
+# maps TextFormat properties to the function setting them in a QTextCharFormat,
+# in the order they are applied
+_TEXT_FORMAT_SETTERS = {
+    "color": _set_color,
+    "background_color": _set_background_color,
+    "text_decoration_line": _set_text_decoration_line,
+    "text_decoration_style": _set_text_decoration_style,
+    "text_decoration_color": _set_text_decoration_color,
+    "font_family": _set_font_family,
+    "font_size": _set_font_size,
+    "font_stretch": _set_font_stretch,
+    "font_style": _set_font_style,
+    "font_variant_caps": _set_font_variant_caps,
+    "font_weight": _set_font_weight,
+}
+
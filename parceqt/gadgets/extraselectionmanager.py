@@ -23,10 +23,12 @@ ExtraSelectionManager managages highlighting of arbitrary sections in a
 Q(Plain)TextEdit.
 """
 
+import heapq
 import operator
-import weakref
+import time
 
 from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QTextCharFormat, QTextCursor
 from PyQt5.QtWidgets import QTextEdit
 
 from ..util import SingleInstance
@@ -36,6 +38,8 @@ class ExtraSelectionManager(SingleInstance):
     """Manages highlighting of arbitrary sections in a Q(Plain)TextEdit.
 
     Stores and highlights lists of QTextCursors on a per-format basis.
+    Changes are applied to the text edit when control returns to the event
+    loop.
 
     Instantiate with::
 
@@ -49,6 +53,10 @@ class ExtraSelectionManager(SingleInstance):
         super().__init__(textedit)
         self._selections = {}
         self._formats = {} # store the QTextFormats
+        self._expiry = []  # heap of (deadline, key) tuples
+        self._timer = QTimer(self, singleShot=True, timeout=self._expire)
+        self._last_selections = []  # copies of the (cursor, format) tuples last set
+        self._update_timer = QTimer(self, singleShot=True, interval=0, timeout=self._do_update)
 
     def highlight(self, text_format, cursors, priority=0, msec=0):
         """Highlight the selection of an arbitrary list of QTextCursors.
@@ -61,20 +69,12 @@ class ExtraSelectionManager(SingleInstance):
         """
         key = id(text_format)
         self._formats[key] = text_format
-        selections = []
-        for cursor in cursors:
-            es = QTextEdit.ExtraSelection()
-            es.cursor = cursor
-            es.format = text_format
-            selections.append(es)
+        selections = [(cursor, text_format) for cursor in cursors]
         if msec:
-            def clear(selfref=weakref.ref(self)):
-                self = selfref()
-                if self:
-                    self.clear(text_format)
-            timer = QTimer(timeout=clear, singleShot=True)
-            timer.start(msec)
-            self._selections[key] = (priority, selections, timer)
+            deadline = time.monotonic() + msec / 1000
+            heapq.heappush(self._expiry, (deadline, key))
+            self._selections[key] = (priority, selections, deadline)
+            self._schedule_expire()
         else:
             self._selections[key] = (priority, selections)
         self._update()
@@ -98,18 +98,69 @@ class ExtraSelectionManager(SingleInstance):
         else:
             self._formats.clear()
             self._selections.clear()
+            self._expiry.clear()
+            self._timer.stop()
         self._update()
 
+    def _schedule_expire(self):
+        """(Internal) Start the timer for the first highlighting to expire."""
+        if self._expiry:
+            msec = (self._expiry[0][0] - time.monotonic()) * 1000
+            self._timer.start(max(0, int(msec) + 1))
+        else:
+            self._timer.stop()
+
+    def _expire(self):
+        """(Internal) Called by the timer, removes all expired highlighting."""
+        now = time.monotonic()
+        changed = False
+        while self._expiry and self._expiry[0][0] <= now:
+            deadline, key = heapq.heappop(self._expiry)
+            sel = self._selections.get(key)
+            # skip if the format was highlighted again in the meantime
+            if sel and len(sel) > 2 and sel[2] == deadline:
+                del self._selections[key]
+                del self._formats[key]
+                changed = True
+        self._schedule_expire()
+        if changed:
+            self._update()
+
     def _update(self):
-        """(Internal) Called whenever the arbitrary highlighting changes."""
+        """(Internal) Called whenever the arbitrary highlighting changes.
+
+        The text edit is updated when control returns to the event loop, so
+        many changes in a row only cause one update.
+
+        """
+        self._update_timer.start()
+
+    def _do_update(self):
+        """(Internal) Set the extra selections in the text edit."""
         textedit = self.parent()
         if textedit:
             selections = sorted(self._selections.values(), key=operator.itemgetter(0))
-            ess = sum(map(operator.itemgetter(1), selections), [])
-            textedit.setExtraSelections(ess)
+            sels = sum(map(operator.itemgetter(1), selections), [])
+            # skip if the same selections were set the last time; compare
+            # copies, as the caller may have changed a cursor or format
+            last = self._last_selections
+            if len(sels) != len(last) or any(c1 != c2 or f1 != f2
+                    for (c1, f1), (c2, f2) in zip(sels, last)):
+                self._last_selections = [(QTextCursor(c), QTextCharFormat(f)) for c, f in sels]
+                textedit.setExtraSelections([_extra_selection(*s) for s in sels])
 
     def delete(self):
         """Reimplemented to remove all highlighting before delete."""
         self.clear()
+        self._update_timer.stop()
+        self._do_update()
         super().delete()
 
+
+def _extra_selection(cursor, text_format):
+    """Return a QTextEdit.ExtraSelection for the cursor and the format."""
+    es = QTextEdit.ExtraSelection()
+    es.cursor = cursor
+    es.format = text_format
+    return es
+
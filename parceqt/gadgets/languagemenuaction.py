@@ -26,9 +26,6 @@ all languages in the/a parce :class:`~parce.registry.Registry`.
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QAction, QActionGroup, QMenu
 
-import parce.registry
-
-
 
 class LanguageMenuAction(QAction):
     """A QAction that shows a section-based submenu for all languages in the/a
@@ -45,9 +42,13 @@ class LanguageMenuAction(QAction):
     def __init__(self, parent=None, registry=None):
         super().__init__(parent)
         self._registry = None
+        self._actions = {}  # maps qualname to QAction
         self._actionGroup = QActionGroup(self, triggered=self._slot_language_selected)
         self.setMenu(QMenu("", None))
-        self.set_registry(registry or parce.registry.registry)
+        if not registry:
+            import parce.registry
+            registry = parce.registry.registry
+        self.set_registry(registry)
 
     def set_registry(self, registry):
         """Set the :class:`~parce.registry.Registry` and populate ourselves
@@ -76,11 +77,10 @@ class LanguageMenuAction(QAction):
 
     def set_lexicon(self, lexicon):
         """Set the current lexicon, or None."""
-        for a in self._actionGroup.findChildren(QAction):
-            if ((lexicon and a.objectName() == lexicon.qualname) or
-                (not lexicon and not a.objectName())):
-                a.setChecked(True)
-                return
+        a = self._actions.get(lexicon.qualname if lexicon else "")
+        if a:
+            a.setChecked(True)
+            return
         a = self._actionGroup.checkedAction()
         if a:
             a.setChecked(False)
@@ -104,14 +104,17 @@ class LanguageMenuAction(QAction):
         """Called to fill ourselves with submenus from the registry."""
         g = self._actionGroup
         m = self.menu()
-        for a in g.findChildren(QAction):
+        for a in g.actions():
+            g.removeAction(a)
             a.setParent(None)
             a.deleteLater()
+        self._actions.clear()
         actions = m.actions()
         insert_before = None
         if not actions:
             # menu is empty
             a = QAction(g, text="&None", objectName="", checkable=True, checked=True)
+            self._actions[""] = a
             m.addAction(a)
             m.addSeparator()
         else:
@@ -132,7 +135,8 @@ class LanguageMenuAction(QAction):
                 m.insertAction(insert_before, a) if insert_before else m.addAction(a)
                 entries = sorted((self.display_name(qualname), qualname) for qualname in reg[sect].keys())
                 for name, qualname in entries:
-                    submenu.addAction(QAction(g, text=name, objectName=qualname, checkable=True))
+                    a = self._actions[qualname] = QAction(g, text=name, objectName=qualname, checkable=True)
+                    submenu.addAction(a)
         # old items left?
         if actions and index:
             for a in actions[index:]:
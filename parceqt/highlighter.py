@@ -23,8 +23,11 @@ This module provides a SyntaxHighlighter.
 """
 
 
-from PyQt5.QtCore import QEventLoop, QObject, Qt
-from PyQt5.QtGui import QGuiApplication, QTextCharFormat, QTextCursor, QTextLayout
+import bisect
+import time
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+from PyQt5.QtGui import QTextCharFormat, QTextCursor, QTextLayout
 
 import parce.util
 import parce.theme
@@ -48,10 +51,18 @@ class SyntaxHighlighter(util.SingleInstance):
     Formatter, which is needed to enable highlighting.
 
     """
+
+    #: while highlighting a long range, the time (in msec) after which the
+    #: updated part is redrawn and control returns to the event loop
+    process_events_interval = 16
+
     def __init__(self, worker):
         super().__init__(worker)
         self._formatter = None
         self._cursor = None      # remembers the range to rehighlight
+        self._highlighted = None # remembers the range that has formats
+        self._highlighting = None # generator of an interrupted highlighting
+        self._timer = QTimer(self, singleShot=True, interval=0, timeout=self._highlight_step)
         worker.tree_updated.connect(self.slot_updated)
         worker.builder().preview.connect(self.slot_preview, Qt.BlockingQueuedConnection)
 
@@ -91,12 +102,24 @@ class SyntaxHighlighter(util.SingleInstance):
         SyntaxHighlighter is explicitedly :meth:`delete`-d.
 
         """
-        doc = self.document()
-        block = doc.firstBlock()
-        while block.isValid():
-            block.layout().clearFormats()
-            block = block.next()
-        doc.markContentsDirty(0, doc.characterCount() - 1)
+        if self._highlighting:
+            self._highlighting.close()
+            self._highlighting = None
+            self._timer.stop()
+        h = self._highlighted
+        if h:
+            # only clear and redraw the blocks we ever touched
+            doc = self.document()
+            block = doc.findBlock(h.selectionStart())
+            last_block = doc.findBlock(h.selectionEnd())
+            start = block.position()
+            while block.isValid():
+                block.layout().clearFormats()
+                if block == last_block:
+                    break
+                block = block.next()
+            doc.markContentsDirty(start, block.position() + block.length() - start)
+            self._highlighted = None
 
     def rehighlight(self):
         """Draw or clear the highlighting, depending on the Formatter.
@@ -130,14 +153,41 @@ class SyntaxHighlighter(util.SingleInstance):
     def draw_highlighting(self, root, start, end, interruptible=False):
         """Draw the highlighting using tree ``root`` from ``start`` to ``end``.
 
-        If ``interruptible`` is True, ``QApplication::process_events()`` is
-        called every 1000 lines, to enable the user typing in the document,
-        which also causes the highlighting to quit and resume later.
+        If ``interruptible`` is True, the highlighting is interrupted every
+        :attr:`process_events_interval` msec and continued from the event loop,
+        to enable the user typing in the document, which also causes the
+        highlighting to quit and resume later.
 
         """
         if not self._formatter:
             return
+        if interruptible:
+            if self._highlighting:
+                # the unfinished range is remembered in our cursor
+                self._highlighting.close()
+                self._timer.stop()
+            self._highlighting = self._draw_highlighting(root, start, end, True)
+            self._highlight_step()
+        else:
+            for _ in self._draw_highlighting(root, start, end):
+                pass
+
+    def _highlight_step(self):
+        """Continue the interrupted highlighting for one time slice."""
+        try:
+            next(self._highlighting)
+        except StopIteration:
+            self._highlighting = None
+        else:
+            self._timer.start()
+
+    def _draw_highlighting(self, root, start, end, interruptible=False):
+        """Implementation of :meth:`draw_highlighting`.
+
+        This is a generator, that yields when an interruptible highlighting
+        should return to the event loop.
 
+        """
         doc = self.document()
 
         if interruptible:
@@ -152,8 +202,11 @@ class SyntaxHighlighter(util.SingleInstance):
         else:
             c = None
 
+        FormatRange = QTextLayout.FormatRange
         block = doc.findBlock(start)
         pos = block.position()
+        block_end = pos + block.length()
+        block_num = block.blockNumber()
         last_block = doc.findBlock(end)
         if not last_block.isValid():
             last_block = doc.lastBlock()
@@ -162,40 +215,63 @@ class SyntaxHighlighter(util.SingleInstance):
         if c:
             c.setPosition(end)
 
-        num = block.blockNumber() + 100
-        formats = split_formats(block, start)[0]
-        for f in self._formatter.format_ranges(root, start, end):
-            while f.pos >= pos + block.length():
+        # extend the range that has formats, for clear()
+        h = self._highlighted
+        if h:
+            h_start = min(start, h.selectionStart())
+            h_end = max(end, h.selectionEnd())
+        else:
+            h = self._highlighted = QTextCursor(doc)
+            h_start, h_end = start, end
+        h.setPosition(h_end)
+        h.setPosition(h_start, QTextCursor.KeepAnchor)
+
+        num = block_num + 100
+        interval = self.process_events_interval / 1000
+        deadline = time.perf_counter() + interval
+        formats = _start_formats(block, start)
+        for f_pos, f_end, textformat in self._formatter.format_ranges(root, start, end):
+            while f_pos >= block_end:
                 block.layout().setFormats(formats)
                 block = block.next()
-                pos = block.position()
+                pos = block_end
+                block_end = pos + block.length()
+                block_num += 1
                 formats = []
-            r = QTextLayout.FormatRange()
-            r.format = f.textformat
-            r.start = f.pos - pos
-            f_end = min(end, f.end)
-            while f_end > pos + block.length():
-                r.length = block.length() - r.start - 1
+            r_start = f_pos - pos
+            if f_end > end:
+                f_end = end
+            while f_end > block_end:
+                r = FormatRange()
+                r.format = textformat
+                r.start = r_start
+                r.length = block_end - pos - r_start - 1
                 formats.append(r)
                 block.layout().setFormats(formats)
                 block = block.next()
-                pos = block.position()
+                pos = block_end
+                block_end = pos + block.length()
+                block_num += 1
                 formats = []
-                r = QTextLayout.FormatRange()
-                r.format = f.textformat
-                r.start = 0
-            r.length = f_end - pos - r.start
+                r_start = 0
+            r = FormatRange()
+            r.format = textformat
+            r.start = r_start
+            r.length = f_end - pos - r_start
             formats.append(r)
-            if c and block.blockNumber() > num:
-                num = block.blockNumber() + 1000
-                doc.markContentsDirty(start, pos - start)
-                start = pos
-                c.setPosition(start, QTextCursor.KeepAnchor)
-                revision = doc.revision()
-                QGuiApplication.processEvents(QEventLoop.ExcludeSocketNotifiers)
-                # if the user typed, immediately quit, but come back!
-                if doc.revision() != revision:
-                    return
+            if c and block_num > num:
+                num = block_num + 100
+                # only redraw and yield when enough time has passed
+                if time.perf_counter() > deadline:
+                    doc.markContentsDirty(start, pos - start)
+                    start = pos
+                    c.setPosition(start, QTextCursor.KeepAnchor)
+                    revision = doc.revision()
+                    yield
+                    # if the user typed, immediately quit, but come back!
+                    if doc.revision() != revision:
+                        return
+                    deadline = time.perf_counter() + interval
         block.layout().setFormats(formats)
         while block < last_block:
             block = block.next()
@@ -217,34 +293,34 @@ def split_formats(block, position):
     a range.
 
     """
-    def new_format_range(r, offset=0):
-        n = QTextLayout.FormatRange()
-        n.format = r.format
-        n.start = r.start + offset
-        n.length = r.length
-        return n
     pos = position - block.position()
-    formats = iter(block.layout().formats())
-    start_formats = []
-    end_formats = []
-    for r in formats:
-        if r.start < pos:
-            n = new_format_range(r)
-            start_formats.append(n)
-            if r.start + r.length > pos:
-                n.length = pos - r.start
-                n = new_format_range(r)
-                n.start = 0
-                n.length = r.start + r.length - pos
-                end_formats.append(n)
-                break
-        else:
-            n = new_format_range(r, -pos)
-            end_formats.append(n)
-            break
-    for r in formats:
-        n = new_format_range(r, -pos)
-        end_formats.append(n)
+    formats = block.layout().formats()  # these are copies we can modify
+    i = bisect.bisect_left([r.start for r in formats], pos)
+    start_formats = formats[:i]
+    end_formats = formats[i:]
+    for r in end_formats:
+        r.start -= pos
+    if start_formats:
+        r = start_formats[-1]
+        if r.start + r.length > pos:
+            n = QTextLayout.FormatRange()
+            n.format = r.format
+            n.start = 0
+            n.length = r.start + r.length - pos
+            end_formats.insert(0, n)
+            r.length = pos - r.start
     return start_formats, end_formats
 
 
+def _start_formats(block, position):
+    """Return the first list :func:`split_formats` would return."""
+    pos = position - block.position()
+    if not pos:
+        return []
+    formats = block.layout().formats()
+    del formats[bisect.bisect_left([r.start for r in formats], pos):]
+    if formats:
+        r = formats[-1]
+        if r.start + r.length > pos:
+            r.length = pos - r.start
+    return formats
@@ -73,6 +73,11 @@ class TreeBuilder(parce.treebuilder.TreeBuilder, QObject):
 
     def replace_nodes(self, context, slice_, nodes):
         """Reimplemented for fine-grained signals."""
+        if not any(map(self.receivers, (
+                self.begin_remove_rows, self.end_remove_rows,
+                self.begin_insert_rows, self.end_insert_rows))):
+            # nobody listens, replace the nodes in one go
+            return super().replace_nodes(context, slice_, nodes)
         start, end, _step = slice_.indices(len(context))
         end -= 1
         if start < len(context) and start <= end:
@@ -88,7 +93,7 @@ class TreeBuilder(parce.treebuilder.TreeBuilder, QObject):
         """Reimplemented for fine-grained signals."""
         super().replace_pos(context, index, offset)
         start, end = index, len(context) - 1
-        if start <= end:
+        if start <= end and self.receivers(self.change_position):
             self.change_position.emit(context, start, end)
 
     def replace_root_lexicon(self, lexicon):
@@ -63,21 +63,31 @@ class TreeModel(QAbstractItemModel):
         super().__init__(parent)
         self._reset_in_progress = False
         self._root = tree
+        self._data_cache = {}   # (id(node), role): (node, text)
+        self._builders = 0      # texts are only cached while a builder is connected
 
     def connect_builder(self, builder):
-        """Connect to the started and finished signals of a TreeBuilder."""
+        """Connect to the started and finished signals of a TreeBuilder.
+
+        While a builder is connected, the display and tooltip texts are
+        cached; the builder's signals tell when they are outdated.
+
+        """
         builder.started.connect(self.slot_build_started)
         builder.updated.connect(self.slot_build_finished)
+        self._connected(1)
 
     def disconnect_builder(self, builder):
         """Disconnect from the started and finished signals of a TreeBuilder."""
         builder.started.disconnect(self.slot_build_started)
         builder.updated.disconnect(self.slot_build_finished)
+        self._connected(-1)
 
     def connect_debugging_builder(self, builder):
         """Connect to all the signals of a debugging tree builder.
 
-        (See the :mod:`debug` module).
+        (See the :mod:`debug` module). While a builder is connected, the
+        display and tooltip texts are cached.
 
         """
         builder.begin_remove_rows.connect(self.slot_begin_remove_rows)
@@ -86,6 +96,7 @@ class TreeModel(QAbstractItemModel):
         builder.end_insert_rows.connect(self.slot_end_insert_rows)
         builder.change_position.connect(self.slot_change_position)
         builder.change_root_lexicon.connect(self.slot_change_root_lexicon)
+        self._connected(1)
 
     def disconnect_debugging_builder(self, builder):
         """Disconnect from all the signals of a debugging tree builder.
@@ -99,12 +110,19 @@ class TreeModel(QAbstractItemModel):
         builder.end_insert_rows.disconnect(self.slot_end_insert_rows)
         builder.change_position.disconnect(self.slot_change_position)
         builder.change_root_lexicon.disconnect(self.slot_change_root_lexicon)
+        self._connected(-1)
+
+    def _connected(self, count):
+        """Adjust the number of connected builders and clear the text cache."""
+        self._builders += count
+        self._data_cache.clear()
 
     ## reimplemented virtual methods
     def index(self, row, column, parent):
-        if self.hasIndex(row, column, parent):
+        # we check the bounds ourselves, which is cheaper than hasIndex()
+        if column == 0 and row >= 0:
             node = parent.internalPointer() if parent.isValid() else self._root
-            if 0 <= row < len(node):
+            if node.is_context and row < len(node):
                 return self.createIndex(row, column, node[row])
         return QModelIndex()
 
@@ -126,12 +144,8 @@ class TreeModel(QAbstractItemModel):
         return 0
 
     def data(self, index, role):
-        if index.isValid():
-            node = index.internalPointer()
-            if role == Qt.DisplayRole:
-                return self.node_repr(node)
-            elif role == Qt.ToolTipRole:
-                return self.node_tooltip(node)
+        if index.isValid() and role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._node_text(index.internalPointer(), role)
 
     def flags(self, index):
         if index.isValid() and index.internalPointer().is_token:
@@ -141,10 +155,8 @@ class TreeModel(QAbstractItemModel):
     def headerData(self, column, orientation, role):
         """Reimplemented to not show the root element's repr while busy."""
         if not self._reset_in_progress and column == 0 and orientation == Qt.Horizontal:
-            if role == Qt.DisplayRole:
-                return self.node_repr(self._root)
-            elif role == Qt.ToolTipRole:
-                return self.node_tooltip(self._root)
+            if role in (Qt.DisplayRole, Qt.ToolTipRole):
+                return self._node_text(self._root, role)
 
     ## own methods
     def root(self):
@@ -157,6 +169,26 @@ class TreeModel(QAbstractItemModel):
             return self.createIndex(node.parent_index(), 0, node)
         return QModelIndex()
 
+    def _node_text(self, node, role):
+        """Return the display or tooltip text for the node.
+
+        The text is cached if a builder is connected, as only then the cache
+        is cleared when the tree changes.
+
+        """
+        key = id(node), role
+        try:
+            return self._data_cache[key][1]
+        except KeyError:
+            if role == Qt.DisplayRole:
+                text = self.node_repr(node)
+            else:
+                text = self.node_tooltip(node)
+            if self._builders:
+                # keep the node, so its id can't be reused while cached
+                self._data_cache[key] = node, text
+            return text
+
     def get_node(self, index):
         """Return the node (Context or Token) for the specified QModelIndex."""
         return index.internalPointer() if index.isValid() else self._root
@@ -164,26 +196,31 @@ class TreeModel(QAbstractItemModel):
     def slot_build_started(self):
         """Called when tree builder starts."""
         self._reset_in_progress = True
+        self._data_cache.clear()
         self.beginResetModel()
 
     def slot_build_finished(self):
         """Called when tree builder has finished."""
         self._reset_in_progress = False
+        self._data_cache.clear()
         self.endResetModel()
 
     def slot_begin_remove_rows(self, node, first, last):
         self.beginRemoveRows(self.get_model_index(node), first, last)
 
     def slot_end_remove_rows(self):
+        self._data_cache.clear()
         self.endRemoveRows()
 
     def slot_begin_insert_rows(self, node, first, last):
         self.beginInsertRows(self.get_model_index(node), first, last)
 
     def slot_end_insert_rows(self):
+        self._data_cache.clear()
         self.endInsertRows()
 
     def slot_change_position(self, node, first, last):
+        self._data_cache.clear()
         index = self.get_model_index(node)
         self.dataChanged.emit(index, index)
         # the following would be locigal but is very slow:
@@ -192,6 +229,7 @@ class TreeModel(QAbstractItemModel):
         #self.dataChanged.emit(topleft, bottomright)
 
     def slot_change_root_lexicon(self):
+        self._data_cache.clear()
         self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
 
     @staticmethod
@@ -227,7 +265,7 @@ class TreeModel(QAbstractItemModel):
             if not d['group']:
                 d['group'] = "-"
         template = cls.TOKEN_TOOLTIP if node.is_token else cls.CONTEXT_TOOLTIP
-        return template.format(**d).strip()
+        return template.format_map(d).strip()
 
     @classmethod
     def node_repr(cls, node):
@@ -237,6 +275,6 @@ class TreeModel(QAbstractItemModel):
         if node.is_token:
             if d['group']:
                 d['group'] = "({})".format(d['group'])
-        return template.format(**d).strip()
+        return template.format_map(d).strip()
 
 
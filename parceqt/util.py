@@ -22,16 +22,17 @@
 Various utility classes and functions.
 """
 
+import threading
 import weakref
 
-from PyQt5.QtCore import QObject, QThread
+from PyQt5.QtCore import pyqtSignal, QObject, QRunnable, Qt, QThreadPool
 
 
 _jobs = set()   # store running Job instances
 
 
-class Job(QThread):
-    """Simple QThread helper that runs a ``function`` in a background thread.
+class Job(QObject):
+    """Simple helper that runs a ``function`` in a background thread.
 
     If you specify a ``finished`` callable, it will be called when the function
     has finished. If ``with_result`` is True, the ``finished`` callable will
@@ -40,20 +41,46 @@ class Job(QThread):
     The job is started immediately. You do not need to store the job, it will
     keep a reference itself as long as it is running.
 
+    The function is run by Qt's global QThreadPool, so a thread is reused
+    instead of started anew for every job. A Job therefore is not a QThread;
+    besides the ``finished`` signal it only provides :meth:`wait`,
+    :meth:`isRunning` and :meth:`isFinished`.
+
     """
+    #: emitted (in the main thread) when the function has finished
+    finished = pyqtSignal()
+
     def __init__(self, function, finished=None, with_result=False):
         super().__init__()
         self._function = function
         self._finished = finished
         self._with_result = with_result
+        self._done = threading.Event()
         _jobs.add(self)
         self.finished.connect(self._slot_finished)
-        self.start()
+        QThreadPool.globalInstance().start(_JobRunner(self))
 
     def run(self):
         """Run the function and store the result."""
         self._result = self._function()
 
+    def wait(self, msecs=None):
+        """Block until the function has finished, or ``msecs`` have passed.
+
+        Returns True if the function has finished. Note that the ``finished``
+        callable is called later, from the main thread's event loop.
+
+        """
+        return self._done.wait(None if msecs is None else msecs / 1000)
+
+    def isRunning(self):
+        """Return True if the function has not yet finished."""
+        return not self._done.is_set()
+
+    def isFinished(self):
+        """Return True if the function has finished."""
+        return self._done.is_set()
+
     def _slot_finished(self):
         _jobs.discard(self)
         if self._finished is not None:
@@ -63,6 +90,20 @@ class Job(QThread):
                 self._finished()
 
 
+class _JobRunner(QRunnable):
+    """Runs a Job in a thread of the QThreadPool."""
+    def __init__(self, job):
+        super().__init__()
+        self._job = job
+
+    def run(self):
+        try:
+            self._job.run()
+        finally:
+            self._job._done.set()
+            self._job.finished.emit()
+
+
 class SingleInstance(QObject):
     """Keeps a single instance around for another object.
 
@@ -76,7 +117,7 @@ class SingleInstance(QObject):
     @classmethod
     def instance(cls, parent, *args, **kwargs):
         """Get or create the instance for ``parent``."""
-        instance = parent.findChild(cls)
+        instance = cls.get_instance(parent)
         if not instance:
             instance = cls(parent, *args, **kwargs)
         return instance
@@ -84,14 +125,14 @@ class SingleInstance(QObject):
     @classmethod
     def delete_instance(cls, parent):
         """Actively remove the stored instance."""
-        instance = parent.findChild(cls)
+        instance = cls.get_instance(parent)
         if instance:
             instance.delete()
 
     @classmethod
     def get_instance(cls, parent):
         """Return the instance if it already exists, else returns None."""
-        return parent.findChild(cls)
+        return parent.findChild(cls, "", Qt.FindDirectChildrenOnly)
 
     def delete(self):
         """Delete the stored reference to ourself.
@@ -26,8 +26,6 @@ LexiconChooser is a combobox to choose a root lexicon.
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QComboBox
 
-import parce.registry
-
 
 class LexiconChooser(QComboBox):
     """A combobox showing available root lexicons.
@@ -47,7 +45,10 @@ class LexiconChooser(QComboBox):
     def __init__(self, parent=None, registry=None):
         self._registry = None
         super().__init__(parent)
-        self.set_registry(registry or parce.registry.registry)
+        if not registry:
+            import parce.registry
+            registry = parce.registry.registry
+        self.set_registry(registry)
         self.currentIndexChanged.connect(self._slot_current_index_changed)
 
     def set_registry(self, registry):
@@ -79,6 +80,7 @@ class LexiconChooser(QComboBox):
         items = [(self.display_name(None), None)]
         items.extend(sorted((self.display_name(qualname), qualname) for qualname in self.registry().keys()))
         self._items, self._qualnames = zip(*items)
+        self._index = {qualname: i for i, qualname in enumerate(self._qualnames)}
         self.addItems(self._items)
 
     def _lexicon(self, index):
@@ -90,11 +92,8 @@ class LexiconChooser(QComboBox):
     def set_lexicon(self, lexicon):
         """Set the current lexicon (a :class:`~parce.lexicon.Lexicon` or None)."""
         name = lexicon.qualname if lexicon else None
-        try:
-            i = self._qualnames.index(name)
-        except ValueError:
-            pass
-        else:
+        i = self._index.get(name)
+        if i is not None:
             self.setCurrentIndex(i)
 
     def lexicon(self):
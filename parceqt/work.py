@@ -23,7 +23,8 @@ The Worker class, inheriting from parce's Worker class.
 """
 
 
-from PyQt5.QtCore import pyqtSignal, QEventLoop
+from PyQt5.QtCore import pyqtSignal, QCoreApplication, QEventLoop, QThread, QTimer
+from PyQt5.QtGui import QTextCursor
 
 import parce.work
 
@@ -53,14 +54,19 @@ class Worker(parce.work.Worker, util.SingleInstance):
     #: set debugging to True to print some info to the console while running
     debugging = False
 
+    #: the time (in msec) to wait before starting a new update process, changes
+    #: that arrive in the meantime are handled in the same run
+    update_delay = 20
+
     def __init__(self, qtextdocument, treebuilder=None, transformer=None):
         if treebuilder is None:
             from .treebuilder import TreeBuilder
             treebuilder = TreeBuilder(qtextdocument)
         util.SingleInstance.__init__(self, qtextdocument)
+        self._process_timer = QTimer(self, singleShot=True, timeout=self._run_process)
         parce.work.Worker.__init__(self, treebuilder, transformer)
         qtextdocument.contentsChange.connect(self.slot_contents_change)
-        text = qtextdocument.toPlainText()
+        text = self._text = qtextdocument.toPlainText()
         if text:
             self.update(text)
 
@@ -73,11 +79,36 @@ class Worker(parce.work.Worker, util.SingleInstance):
         """Called after modification of the text, retokenizes the modified part."""
         if self.debugging:
             print("Content Change: start {}, removed {}, added {}.".format(start, removed, added))
-        self.update(self.document().toPlainText(), False, start, removed, added)
+        self.update(self._changed_text(start, removed, added), False, start, removed, added)
+
+    def _changed_text(self, start, removed, added):
+        """Return the new text of the document after a contents change.
+
+        The text is patched using the previous text and the added fragment,
+        which is much cheaper than getting the full text of a large document.
+        If the change does not add up, the full text is fetched anyway.
+
+        """
+        doc = self.document()
+        length = doc.characterCount() - 1
+        text = self._text
+        if start + added <= length and len(text) - removed + added == length:
+            c = QTextCursor(doc)
+            c.setPosition(start)
+            c.setPosition(start + added, QTextCursor.KeepAnchor)
+            text = text[:start] + c.selection().toPlainText() + text[start+removed:]
+        else:
+            text = doc.toPlainText()
+        self._text = text
+        return text
 
     ## reimplemented methods
     def run_process(self):
-        """Reimplemented to run parts of the process in a Qt Thread."""
+        """Reimplemented to run the process after :attr:`update_delay` msec."""
+        self._process_timer.start(self.update_delay)
+
+    def _run_process(self):
+        """Run the process, with parts of it in a Qt Thread."""
         process = self.process()
 
         def fg():
@@ -90,19 +121,21 @@ class Worker(parce.work.Worker, util.SingleInstance):
                     print("Processing stage FG:", stage)
 
         def bg():
-            for stage in process:
-                if self.debugging:
-                    print("Processing stage FG:", stage)
-                break
+            stage = next(process, None)
+            if self.debugging and stage:
+                print("Processing stage FG:", stage)
 
         fg()
 
     def wait_build(self):
         """Wait for the build job to be completed.
 
-        Immediately returns if there is no build job active.
+        Immediately returns if there is no build job active. Outside the GUI
+        thread this blocks on the condition without running an event loop.
 
         """
+        if not _in_gui_thread():
+            return super().wait_build()
         with self._condition:
             if self._tree_state & parce.work.REPLACE == 0:
                 return
@@ -113,9 +146,12 @@ class Worker(parce.work.Worker, util.SingleInstance):
     def wait_transform(self):
         """Wait for the transform job to be completed.
 
-        Immediately returns if there is no transform job active.
+        Immediately returns if there is no transform job active. Outside the GUI
+        thread this blocks on the condition without running an event loop.
 
         """
+        if not _in_gui_thread():
+            return super().wait_transform()
         with self._condition:
             if self._transform_state & parce.work.REPLACE == 0:
                 return
@@ -133,7 +169,8 @@ class Worker(parce.work.Worker, util.SingleInstance):
         signals.
 
         """
-        self.tree_updated.emit(self.builder().start, self.builder().end)
+        b = self.builder()
+        self.tree_updated.emit(b.start, b.end)
         self.tree_finished.emit()
         return super().finish_build()
 
@@ -144,3 +181,8 @@ class Worker(parce.work.Worker, util.SingleInstance):
         self.transform_finished.emit()
         return super().finish_transform()
 
+
+def _in_gui_thread():
+    """Return True if called from the thread the QCoreApplication lives in."""
+    app = QCoreApplication.instance()
+    return app is None or QThread.currentThread() is app.thread()
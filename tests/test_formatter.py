@@ -0,0 +1,107 @@
+#! /usr/bin/env python3
+
+"""
+Test the creation of QTextCharFormats from parce TextFormats.
+"""
+
+import copy
+import os
+import sys
+
+sys.path.insert(0, '.')
+
+from PyQt5.QtGui import QFont, QTextCharFormat
+
+import parce.action as a
+import parce.standardaction
+import parce.theme
+import parce.themes
+
+from parceqt.formatter import (
+    _color, _create_text_format, _font_point_size, _font_stretch,
+    _font_weight, text_format)
+
+
+def reference_text_format(tf):
+    """The original construction of a QTextCharFormat, to compare against."""
+    f = QTextCharFormat()
+    if tf.color:
+        f.setForeground(_color(tf.color))
+    if tf.background_color:
+        f.setBackground(_color(tf.background_color))
+    if tf.text_decoration_line:
+        if 'underline' in tf.text_decoration_line:
+            f.setFontUnderline(True)
+        if 'overline' in tf.text_decoration_line:
+            f.setFontOverline(True)
+        if 'line-through' in tf.text_decoration_line:
+            f.setFontStrikeOut(True)
+    if tf.text_decoration_style:
+        s = tf.text_decoration_style
+        if s == "solid":
+            f.setUnderlineStyle(QTextCharFormat.SingleUnderline)
+        elif s == "dotted":
+            f.setUnderlineStyle(QTextCharFormat.DotLine)
+        elif s == "dashed":
+            f.setUnderlineStyle(QTextCharFormat.DashUnderline)
+        elif s == "wavy":
+            f.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+    if tf.text_decoration_color:
+        f.setUnderlineColor(_color(tf.text_decoration_color))
+    if tf.font_family:
+        try:
+            f.setFontFamilies(tf.font_family)
+        except AttributeError:
+            pass
+        f.setFontFamily(tf.font_family[0])
+    if tf.font_size:
+        f.setFontPointSize(_font_point_size(tf.font_size, tf.font_size_unit))
+    if tf.font_stretch:
+        f.setFontStretch(_font_stretch(tf.font_stretch))
+    if tf.font_style in ('italic', 'oblique'):
+        f.setFontItalic(True)
+    if tf.font_variant_caps == "small-caps":
+        f.setFontCapitalization(QFont.SmallCaps)
+    if tf.font_weight:
+        f.setFontWeight(_font_weight(tf.font_weight))
+    if not f.isEmpty():
+        return f
+
+
+def themes():
+    """Yield all bundled themes."""
+    d = os.path.dirname(parce.themes.__file__)
+    for name in sorted(os.listdir(d)):
+        if name.endswith('.css'):
+            yield parce.theme.Theme(os.path.join(d, name))
+
+
+def text_formats():
+    """Yield all TextFormats of the bundled themes."""
+    actions = [getattr(a, name) for name in dir(a)
+        if isinstance(getattr(a, name), parce.standardaction.StandardAction)]
+    actions += [a.Name.Tag, a.Name.Function, a.Name.Attribute, a.Literal.Color,
+        a.String.Double, a.Comment.Alert, a.Keyword.Reserved]
+    for theme in themes():
+        for role in ("window", "selection", "current-line"):
+            yield theme.baseformat(role)
+        for action in actions:
+            yield theme.textformat(action)
+
+
+def test_main():
+    tfs = list(text_formats())
+    assert tfs
+
+    for tf in tfs:
+        # the properties must also be set in the same order
+        assert text_format(tf) == reference_text_format(tf)
+
+        # the order the properties were set in must not matter
+        tf2 = copy.copy(tf)
+        tf2.__dict__ = dict(reversed(list(vars(tf).items())))
+        assert _create_text_format(tf2) == _create_text_format(tf)
+
+
+if __name__ == "__main__":
+    test_main()